@@ -23,6 +23,7 @@ setup(
     ],
     extras_require={
         'interactive': ['jupyter', 'pytest-plots'],
+        'numba': ['numba'],
     },
     packages=find_packages(
         where='./src'
@@ -1,12 +1,72 @@
 import numpy as np
-from scipy.optimize import curve_fit
+from scipy.optimize import least_squares
 from perturbopy.postproc.calc_modes.calc_mode import CalcMode
-from perturbopy.postproc.utils.constants import energy_conversion_factor, length_conversion_factor
+from perturbopy.postproc.utils.constants import energy_conversion_factor
 from perturbopy.postproc.dbs.units_dict import UnitsDict
 from perturbopy.postproc.dbs.recip_pt_db import RecipPtDB
 from perturbopy.postproc.utils.plot_tools import plot_dispersion, plot_recip_pt_labels
 from perturbopy.postproc.utils.lattice import reshape_points, cryst2cart
 
+try:
+    from numba import njit
+    _has_numba = True
+except ImportError:
+    _has_numba = False
+
+    def njit(*args, **kwargs):
+        """
+        Fallback for numba.njit when numba is not installed: returns the function unchanged.
+
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _parabola(kpoint_dist_squared, prefactor, E_0):
+    return prefactor * kpoint_dist_squared + E_0
+
+
+@njit(cache=True)
+def _parabola_jac(kpoint_dist_squared):
+    return kpoint_dist_squared.reshape(-1, 1)
+
+
+if _has_numba:
+    # single pass over the array for both the extremum and its index
+
+    @njit(cache=True)
+    def _min_argmin(a):
+        m = a[0]
+        k = 0
+        for i in range(1, a.size):
+            if a[i] < m:
+                m = a[i]
+                k = i
+        return m, k
+
+    @njit(cache=True)
+    def _max_argmax(a):
+        m = a[0]
+        k = 0
+        for i in range(1, a.size):
+            if a[i] > m:
+                m = a[i]
+                k = i
+        return m, k
+
+else:
+    # a pure Python loop would be far slower than two NumPy passes
+
+    def _min_argmin(a):
+        k = np.argmin(a)
+        return a[k], k
+
+    def _max_argmax(a):
+        k = np.argmax(a)
+        return a[k], k
+
 
 class Bands(CalcMode):
     """
@@ -36,18 +96,24 @@ class Bands(CalcMode):
         if self.calc_mode != 'bands':
             raise ValueError('Calculation mode for a BandsCalcMode object should be "bands"')
 
-        kpath_units = self._pert_dict['bands'].pop('k-path coordinate units')
-        kpath = np.array(self._pert_dict['bands'].pop('k-path coordinates'))
-        kpoint_units = self._pert_dict['bands'].pop('k-point coordinate units')
-        kpoint = np.array(self._pert_dict['bands'].pop('k-point coordinates'))
+        bands_dict = self._pert_dict['bands']
 
-        energies_dict = self._pert_dict['bands'].pop('band index')
-        num_bands = self._pert_dict['bands'].pop('number of bands')
-        energy_units = self._pert_dict['bands'].pop('band units')
+        kpath_units = bands_dict.pop('k-path coordinate units')
+        kpath = np.asarray(bands_dict.pop('k-path coordinates'))
+        kpoint_units = bands_dict.pop('k-point coordinate units')
+        kpoint = np.asarray(bands_dict.pop('k-point coordinates'))
+
+        energies_dict = bands_dict.pop('band index')
+        num_bands = bands_dict.pop('number of bands')
+        energy_units = bands_dict.pop('band units')
 
         self.kpt = RecipPtDB.from_lattice(kpoint, kpoint_units, self.lat, self.recip_lat, kpath, kpath_units)
         self.bands = UnitsDict.from_dict(energies_dict, energy_units)
 
+        # invariants of the effective mass fits, computed once per object
+        self._to_hartree = energy_conversion_factor(self.bands.units, 'hartree')
+        self._k_prefactor = (2 * np.pi / self.alat) ** 2
+
     def indirect_bandgap(self, n_lower, n_upper):
         """
         Method to compute the indirect bandgap between two bands.
@@ -73,16 +139,25 @@ class Bands(CalcMode):
 
         """
 
-        if n_lower not in self.bands.keys() or n_upper not in self.bands.keys():
+        bands = self.bands
+
+        if n_lower not in bands or n_upper not in bands:
             raise ValueError("n_lower and n_upper must be valid band numbers.")
 
         if n_lower > n_upper:
             raise ValueError("n_lower must be less than or equal to n_upper.")
 
-        gap = np.min(self.bands[n_upper]) - np.max(self.bands[n_lower])
+        upper = bands[n_upper]
+        lower = bands[n_lower]
+        points = self.kpt.points
+
+        upper_min, upper_idx = _min_argmin(upper)
+        lower_max, lower_idx = _max_argmax(lower)
 
-        lower_kpoint = self.kpt.points[:, np.argmax(self.bands[n_lower])]
-        upper_kpoint = self.kpt.points[:, np.argmin(self.bands[n_upper])]
+        gap = upper_min - lower_max
+
+        lower_kpoint = points[:, lower_idx]
+        upper_kpoint = points[:, upper_idx]
 
         return gap, lower_kpoint, upper_kpoint
 
@@ -116,9 +191,14 @@ class Bands(CalcMode):
         if n_lower > n_upper:
             raise ValueError("n_lower must be less than or equal to n_upper.")
 
-        transitions = self.bands[n_upper] - self.bands[n_lower]
-        gap = np.min(transitions)
-        kpoint = self.kpt.points[:, np.argmin(transitions)]
+        upper = self.bands[n_upper]
+        lower = self.bands[n_lower]
+
+        transitions = np.empty_like(upper)
+        np.subtract(upper, lower, out=transitions)
+
+        gap, imin = _min_argmin(transitions)
+        kpoint = self.kpt.points[:, imin]
 
         return gap, kpoint
 
@@ -131,15 +211,17 @@ class Bands(CalcMode):
         n : int
            Index of the band for which to calculate the effective mass.
 
-        kpoint : list
-           The k-point on which to center the calculation.
+        kpoint : array_like
+           The k-point on which to center the calculation, or an array of shape (3, M) of k-points,
+           in which case the effective mass is computed at each of them.
 
         max_distance : float
            Maximum distance between the center k-point and k-points to include in the parabolic approximation.
 
         direction : array_like, optional
            The k-point specifying the direction of the effective mass. Defaults to the same value as kpoint,
-           i.e. the longitudinal effective mass.
+           i.e. the longitudinal effective mass. For several k-points, either a single direction or one
+           direction per k-point, with shape (3, M).
 
         ax : matplotlib.axes.Axes
            Axis on which to plot the bands and approximated parabolic curve
@@ -149,36 +231,43 @@ class Bands(CalcMode):
 
         Returns
         -------
-        effective_mass : float
+        effective_mass : float or array
            The longitudinal effective mass at band n and the inputted kpoint, computed by a parabolic fit.
+           An array of M effective masses if M k-points were given.
 
         """
 
+        kpoints = reshape_points(kpoint)
+        num_kpoints = kpoints.shape[1]
+
         # Default direction is longitudinal, i.e. in same direction as central k-point
         if direction is None:
-            direction = kpoint
+            directions = kpoints
         else:
-            direction = reshape_points(direction)
+            directions = np.broadcast_to(reshape_points(direction), kpoints.shape)
 
-        kpoint = reshape_points(kpoint)
+        energies = self.bands[n] * self._to_hartree
+        kpoint_idxs = [self.kpt.find(kpoints[:, m])[0] for m in range(num_kpoints)]
 
-        energies = self.bands[n] * energy_conversion_factor(self.bands.units, 'hartree')
-        alat = self.alat * length_conversion_factor(self.alat_units, 'bohr')
-        E_0 = energies[self.kpt.find(kpoint)][0]
+        # Distances to and angles with all the center k-points at once, shapes (3, K, M) and (K, M)
+        points = self.kpt.points
 
-        def get_fit_data(max_fit_distance, kpoint, direction, max_points=None, epsilon=1e-6):
+        diff = points[:, :, None] - kpoints[:, None, :]
+        kpoint_distances = np.sqrt(np.einsum('ijk,ijk->jk', diff, diff))
+        kpoint_norms = np.sqrt(np.einsum('ij,ij->j', points, points))
 
-            kpoint_distances = np.linalg.norm(self.kpt.points - np.array(kpoint), axis=0)
-            kpoint_mag_squared = np.linalg.norm(self.kpt.points, axis=0)
+        cos_angle = np.zeros_like(kpoint_distances)
+        np.divide(np.einsum('im,ij->jm', directions, points), np.outer(kpoint_norms, np.linalg.norm(directions, axis=0)),
+                  out=cos_angle, where=kpoint_norms[:, None] != 0)
+
+        def get_fit_data(max_fit_distance, m, max_points=None, epsilon=1e-6):
 
             # Find all k-points parallel to the direction within a tolerance, epsilon
-            kpoint_parallel = abs(np.divide(np.dot(np.reshape(direction, (3,)), self.kpt.points), (np.linalg.norm(direction) * kpoint_mag_squared),
-                                            where=kpoint_mag_squared != 0) - 1) < epsilon
+            kpoint_parallel = np.abs(cos_angle[:, m] - 1.0) < epsilon
+            kpoint_idx = kpoint_idxs[m]
 
             if max_points is None:
-                kpoint_indices = np.where(np.logical_and(kpoint_distances < max_fit_distance, kpoint_parallel))[0]
-
-                kpoint_idx = self.kpt.find(kpoint)[0]
+                kpoint_indices = np.where(np.logical_and(kpoint_distances[:, m] < max_fit_distance, kpoint_parallel))[0]
 
                 if kpoint_idx not in kpoint_indices.flatten():
                     kpoint_indices = np.append(kpoint_indices, kpoint_idx)
@@ -186,39 +275,49 @@ class Bands(CalcMode):
                 kpoint_indices = np.sort(kpoint_indices)
             else:
                 kpoint_indices = np.where(kpoint_parallel)[0]
-                kpoint_idx = self.kpt.find(kpoint)[0]
                 kpoint_indices = np.where(abs(kpoint_indices - kpoint_idx) <= max_points)[0]
 
-            kpoint_idx = self.kpt.find(kpoint)[0]
+            # cryst2cart is linear, so the cartesian offsets from the central k-point
+            # are obtained directly from the crystal offsets computed above
+            kpt_diff = cryst2cart(diff[:, kpoint_indices, m], self.lat, self.recip_lat, forward=True, real_space=False)
 
-            kpt_points = self.kpt.points[:, kpoint_indices]
+            kpoint_distances_squared = np.einsum('ij,ij->j', kpt_diff, kpt_diff) * self._k_prefactor
 
-            kpt_points = cryst2cart(kpt_points, self.lat, self.recip_lat, forward=True, real_space=False)
-            kpoint = cryst2cart(kpoint, self.lat, self.recip_lat, forward=True, real_space=False)
+            return kpoint_indices, kpoint_distances_squared
 
-            kpoint_distances_squared = np.sum(np.square(kpt_points - kpoint), axis=0) * (np.pi * 2 / self.alat) ** 2
+        if ax is not None:
+            ax = self.plot_bands(ax, 'k')
 
-            return kpoint_indices, kpoint_distances_squared
+        effective_masses = np.empty(num_kpoints)
 
-        def parabolic_approx(kpoint_dist_squared, prefactor):
-            return prefactor * kpoint_dist_squared + E_0
+        for m in range(num_kpoints):
+            E_0 = energies[kpoint_idxs[m]]
 
-        fit_indices, fit_distances_squared = get_fit_data(max_distance, kpoint, direction)
-        fit_energies = energies[fit_indices]
-        fit_params, pcov = curve_fit(parabolic_approx, fit_distances_squared, fit_energies)
+            fit_indices, fit_distances_squared = get_fit_data(max_distance, m)
+            fit_energies = energies[fit_indices]
 
-        effective_mass = 1 / (fit_params[0] * 2)
+            # only the prefactor is needed, so call least_squares directly rather than curve_fit
+            def residuals(params):
+                return _parabola(fit_distances_squared, params[0], E_0) - fit_energies
 
-        if ax is not None:
-            ax = self.plot_bands(ax, 'k')
+            def residuals_jac(params):
+                return _parabola_jac(fit_distances_squared)
+
+            fit_params = least_squares(residuals, x0=[0.0], jac=residuals_jac, method='lm', ftol=1e-6, xtol=1e-6).x
+
+            effective_masses[m] = 1 / (fit_params[0] * 2)
+
+            if ax is not None:
+                plot_indices, plot_distances_squared = get_fit_data(max_distance * 1.8, m)
+                energies_fitted = (fit_params[0] * plot_distances_squared + E_0) * energy_conversion_factor('hartree', self.bands.units)
 
-            plot_indices, plot_distances_squared = get_fit_data(max_distance * 1.8, kpoint, direction)
-            energies_fitted = (fit_params[0] * plot_distances_squared + E_0) * energy_conversion_factor('hartree', self.bands.units)
+                ax.plot(self.kpt.path[plot_indices], energies_fitted, c, marker=None, ls='--')
+                ax.plot(self.kpt.path[fit_indices], energies[fit_indices] * energy_conversion_factor('hartree', self.bands.units), c, marker='o')
 
-            ax.plot(self.kpt.path[plot_indices], energies_fitted, c, marker=None, ls='--')
-            ax.plot(self.kpt.path[fit_indices], energies[fit_indices] * energy_conversion_factor('hartree', self.bands.units), c, marker='o')
+        if num_kpoints == 1:
+            return effective_masses[0]
 
-        return effective_mass
+        return effective_masses
 
     def plot_bands(self, ax, show_kpoint_labels=True, **kwargs):
         """
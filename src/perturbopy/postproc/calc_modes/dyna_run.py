@@ -24,7 +24,7 @@ class DynaRun(CalcMode):
         Python dictionary of DynaIndivRun objects containing results from each simulation
     """
 
-    def __init__(self, cdyna_file, tet_file, pert_dict):
+    def __init__(self, cdyna_file, tet_file, pert_dict, dtype=np.float64):
         """
         Constructor method
 
@@ -32,6 +32,9 @@ class DynaRun(CalcMode):
         ----------
         pert_dict : dict
             Dictionary containing the inputs and outputs from the dynamics-run calculation.
+        dtype : data-type, optional
+            Floating point type in which the distribution functions (snap_t) are stored. Default np.float64.
+            np.float32 halves the memory, but flushes occupations below ~1e-45 to zero.
 
         """
         
@@ -58,29 +61,47 @@ class DynaRun(CalcMode):
         with self.timings.add('iterate_dyna') as t:
 
             for irun in range(1, self.num_runs + 1):
-                dyn_str = f'dynamics_run_{irun}'
+                dyn_grp = cdyna_file[f'dynamics_run_{irun}']
 
-                num_steps = cdyna_file[dyn_str]['num_steps'][()]
-                time_step = cdyna_file[dyn_str]['time_step_fs'][()]
+                num_steps = dyn_grp['num_steps'][()]
+                time_step = dyn_grp['time_step_fs'][()]
 
-                # a dynamics run must have at least one snap
-                numk, numb = cdyna_file[dyn_str]['snap_t_1'][()].shape
+                if 'snap_t_all' in dyn_grp:
+                    # all the snaps stored in one (num_steps, numk, numb) dataset: a single read
+                    snap_t_all = dyn_grp['snap_t_all']
 
-                snap_t = np.zeros((numb, numk, num_steps), dtype=np.float64)
+                    if snap_t_all.shape[0] != num_steps:
+                        raise ValueError(f'snap_t_all of dynamics_run_{irun} has {snap_t_all.shape[0]} snaps, '
+                                         f'but num_steps is {num_steps}')
 
-                for itime in range(num_steps):
-                    snap_t[:, :, itime] = cdyna_file[dyn_str][f'snap_t_{itime+1}'][()].T
+                    # HDF5 converts to dtype while reading, as for the per-snap reads below
+                    buf = np.empty(snap_t_all.shape, dtype=dtype)
+                    snap_t_all.read_direct(buf)
+                    snap_t = np.ascontiguousarray(np.transpose(buf, (2, 1, 0)))
+
+                else:
+                    # a dynamics run must have at least one snap
+                    numk, numb = dyn_grp['snap_t_1'].shape
+
+                    # read each snap into a scratch buffer and copy its transpose
+                    # into the time slice of snap_t; HDF5 converts to dtype while reading
+                    snap_t = np.empty((numb, numk, num_steps), dtype=dtype)
+                    buf = np.empty((numk, numb), dtype=dtype)
+
+                    for itime in range(num_steps):
+                        dyn_grp[f'snap_t_{itime+1}'].read_direct(buf)
+                        np.copyto(snap_t[:, :, itime], buf.T)
 
                 # Get E-field, which is only present if nonzero
-                if "efield" in cdyna_file[dyn_str].keys():
-                    efield = cdyna_file[dyn_str]["efield"][()]
+                if "efield" in dyn_grp:
+                    efield = dyn_grp["efield"][()]
                 else:
                     efield = np.array([0.0, 0.0, 0.0])
 
                 self._data[irun] = DynaIndivRun(num_steps, time_step, snap_t, time_units='fs', efield=efield)
 
     @classmethod
-    def from_hdf5_yaml(cls, cdyna_path, tet_path, yaml_path='pert_output.yml'):
+    def from_hdf5_yaml(cls, cdyna_path, tet_path, yaml_path='pert_output.yml', dtype=np.float64):
         """
         Class method to create a DynamicsRunCalcMode object from the HDF5 file and YAML file
         generated by a Perturbo calculation
@@ -93,6 +114,9 @@ class DynaRun(CalcMode):
            Path to the HDF5 file generated by the setup calculation required before the dynamics-run calculation
         yaml_path : str, optional
            Path to the YAML file generated by a dynamics-run calculation
+        dtype : data-type, optional
+           Floating point type in which the distribution functions (snap_t) are stored. Default np.float64.
+           np.float32 halves the memory, but flushes occupations below ~1e-45 to zero.
 
         Returns
         -------
@@ -112,7 +136,12 @@ class DynaRun(CalcMode):
         cdyna_file = open_hdf5(cdyna_path)
         tet_file = open_hdf5(tet_path)
 
-        return cls(cdyna_file, tet_file, yaml_dict)
+        # everything is read eagerly, so the files can be closed once the object is built
+        try:
+            return cls(cdyna_file, tet_file, yaml_dict, dtype=dtype)
+        finally:
+            close_hdf5(cdyna_file)
+            close_hdf5(tet_file)
 
     def __getitem__(self, index):
         """
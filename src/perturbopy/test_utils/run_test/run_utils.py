@@ -439,7 +439,7 @@ def define_nq_num(output_name):
     return nq_num
 
 
-def ph_collection(prefix, nq_num):
+def ph_collection(prefix, nq_num, path='.'):
     """
     Collect the phonon data into a directory called save.
     The save directory contains all the information needed
@@ -450,25 +450,30 @@ def ph_collection(prefix, nq_num):
         prefix of this calculation
     nq_num : int
         number of q points in this calculation
+    path : str, optional
+        directory of the phonon calculation, default: current directory
     """
-    print(os.getcwd())
-    
-    os.makedirs('save', exist_ok=True)
+    print(os.path.abspath(path))
+
+    save = os.path.join(path, 'save')
+    tmp = os.path.join(path, 'tmp')
+
+    os.makedirs(save, exist_ok=True)
     
     # remove wfc files in tmp
-    if os.path.exists('tmp'):
-        for file in os.listdir('tmp'):
+    if os.path.exists(tmp):
+        for file in os.listdir(tmp):
             if 'wfc' in file:
-                os.remove(f'tmp/{file}')
+                os.remove(f'{tmp}/{file}')
 
-    dir = 'tmp/_ph0'
+    dir = f'{tmp}/_ph0'
     
-    shutil.copytree(f'{dir}/{prefix}.phsave', f'save/{prefix}.phsave')
+    shutil.copytree(f'{dir}/{prefix}.phsave', f'{save}/{prefix}.phsave')
     
     # copy dyn files
-    for file in os.listdir('.'):
+    for file in os.listdir(path):
         if file.startswith(f'{prefix}.dyn'):
-            shutil.copy(file, 'save')
+            shutil.copy(os.path.join(path, file), save)
 
     for nq in range(1, nq_num + 1):
         
@@ -477,10 +482,10 @@ def ph_collection(prefix, nq_num):
 
             # parallel version
             if os.path.exists(f'{dir}/{prefix}.q_{nq}/{prefix}.dvscf1'):
-                shutil.copy(f'{dir}/{prefix}.q_{nq}/{prefix}.dvscf1', f'save/{prefix}.dvscf_q{nq}')
+                shutil.copy(f'{dir}/{prefix}.q_{nq}/{prefix}.dvscf1', f'{save}/{prefix}.dvscf_q{nq}')
             # serial version
             elif os.path.exists(f'{dir}/{prefix}.q_{nq}/{prefix}.dvscf'):
-                shutil.copy(f'{dir}/{prefix}.q_{nq}/{prefix}.dvscf', f'save/{prefix}.dvscf_q{nq}')
+                shutil.copy(f'{dir}/{prefix}.q_{nq}/{prefix}.dvscf', f'{save}/{prefix}.dvscf_q{nq}')
             else:
                 raise FileNotFoundError(f"{dir}/{prefix}.q_{nq}/{prefix}.dvscf and {dir}/{prefix}.q_{nq}/{prefix}.dvscf1 don't exist")
 
@@ -492,10 +497,10 @@ def ph_collection(prefix, nq_num):
 
             # parallel version
             if os.path.exists(f'{dir}/{prefix}.dvscf1'):
-                shutil.copy(f'{dir}/{prefix}.dvscf1', f'save/{prefix}.dvscf_q{nq}')
+                shutil.copy(f'{dir}/{prefix}.dvscf1', f'{save}/{prefix}.dvscf_q{nq}')
             # serial version
             elif os.path.exists(f'{dir}/{prefix}.dvscf'):
-                shutil.copy(f'{dir}/{prefix}.dvscf', f'save/{prefix}.dvscf_q{nq}')
+                shutil.copy(f'{dir}/{prefix}.dvscf', f'{save}/{prefix}.dvscf_q{nq}')
             else:
                 raise FileNotFoundError(f"{dir}/{prefix}.dvscf and {dir}/{prefix}.dvscf1 don't exist")
 
@@ -503,4 +508,4 @@ def ph_collection(prefix, nq_num):
                 if 'wfc' in file:
                     os.remove(f'{dir}/{file}')
              
-    shutil.copy(f'save/{prefix}.dyn0', f'save/{prefix}.dyn0.xml')
+    shutil.copy(f'{save}/{prefix}.dyn0', f'{save}/{prefix}.dyn0.xml')
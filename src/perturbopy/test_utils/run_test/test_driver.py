@@ -2,11 +2,14 @@
    Run an executable for the testsuite.
 """
 import numpy as np
+import functools
 import os
 import sys
 import shlex
 import shutil
 import subprocess
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from perturbopy.io_utils.io import open_yaml
 from perturbopy.test_utils.run_test.env_utils import run_from_config_machine
 from perturbopy.test_utils.run_test.env_utils import perturbo_scratch_dir_config
@@ -14,6 +17,257 @@ from perturbopy.test_utils.run_test.run_utils import print_test_info, setup_defa
 from perturbopy.test_utils.run_test.run_utils import ph_collection, define_nq_num
 
 
+@functools.lru_cache(maxsize=None)
+def _walk_index(source_folder):
+    """
+    Walk the source folder once and cache the list of all its subdirectories.
+    The inputs and refs directories do not change during a testsuite run, so the
+    cached list stays valid even as the scratch directories are created and removed.
+
+    Parameters
+    ----------
+    source_folder : str
+        path of source directory
+
+    Returns
+    -------
+    dirs : tuple
+        paths of all directories under source_folder, in os.walk order
+
+    """
+    return tuple(x[0] for x in os.walk(source_folder))
+
+
+def _find_suffix(source_folder, suffix):
+    """
+    Find the first directory under source_folder whose path ends with suffix
+
+    Parameters
+    ----------
+    source_folder : str
+        path of source directory
+    suffix : str
+        ending of the path to look for, e.g. 'inputs/test_name'
+
+    Returns
+    -------
+    path : str
+        path of the first matching directory
+
+    """
+    return [d for d in _walk_index(source_folder) if d.endswith(suffix)][0]
+
+
+def _with_prel(prel, run):
+    """
+    Function to prepend preliminary commands to a shell command. The standard output of the
+    preliminary commands is sent to the standard error, so that only the output of the command
+    itself is captured (as with `prel; run | tee output_name`)
+
+    Parameters
+    ----------
+    prel : str
+        preliminary commands, one per line
+    run : str
+        shell command(s) to run
+
+    Returns
+    -------
+    str
+        shell command(s) running prel and then run in the same shell
+
+    """
+    if not prel:
+        return run
+
+    return f'{{ {prel}\n}} >&2\n{run}'
+
+
+def _run_tee(run, output_name, cwd=None, prel=''):
+    """
+    Function to run a shell command, writing its standard output both to a file
+    and to the standard output of this process (as `prel; run | tee output_name` would)
+
+    Parameters
+    ----------
+    run : str
+        shell command(s) to run
+    output_name : str
+        name of the file to which the output of run is written, relative to cwd
+    cwd : str, optional
+        directory in which to run the command(s), default: current working directory
+    prel : str, optional
+        preliminary commands to run before run, whose output is not written to the file, default: ''
+
+    Returns
+    -------
+    None
+
+    """
+    proc = subprocess.Popen(_with_prel(prel, run), shell=True, stdout=subprocess.PIPE, cwd=cwd)
+
+    with open(os.path.join(cwd or '', output_name), 'wb') as f:
+        for chunk in iter(lambda: proc.stdout.read1(65536), b''):
+            f.write(chunk)
+            sys.stdout.buffer.write(chunk)
+            sys.stdout.flush()
+
+    proc.wait()
+
+
+class _ShellSession:
+    """
+    Persistent bash process, in which the computational steps are run one after another.
+    The global preliminary commands from config_machine (e.g. module loads) are run only
+    once, when the session starts. Each step runs in a subshell, so that the preliminary
+    commands of one step do not affect the following ones.
+
+    Parameters
+    ----------
+    config_machine : dict
+        dictionary with computational information, which we'll use in this set of computations.
+
+    """
+
+    def __init__(self, config_machine):
+        """
+        Constructor method
+
+        """
+        self.proc = subprocess.Popen(['bash'], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+        print(' == Prel commands == :')
+        for com in config_machine.get('prel_coms', []):
+            print(f' ======= Run ======= :\n {com}')
+            sys.stdout.flush()
+            # run in the session shell itself, so that e.g. module loads persist,
+            # but not reading the commands of the session as their standard input
+            self.proc.stdin.write(f'{{ {com}\n}} < /dev/null\n'.encode())
+
+        self.run(':')
+
+    def run(self, run, output_name=None, cwd=None, prel=''):
+        """
+        Method to run shell command(s) in the session and wait for them to finish.
+
+        Parameters
+        ----------
+        run : str
+            shell command(s) to run
+        output_name : str, optional
+            name of the file to which the standard output of run is also written, relative to cwd, default: None
+        cwd : str, optional
+            directory in which to run the command(s), default: current working directory
+        prel : str, optional
+            preliminary commands to run before run, whose output is not written to the file, default: ''
+
+        Returns
+        -------
+        returncode : int
+            exit status of the command(s)
+
+        """
+        # the session shell may be in another directory than this process
+        cwd = os.path.abspath(cwd or '.')
+
+        if not os.path.isdir(cwd):
+            raise FileNotFoundError(f'Directory {cwd} not found')
+
+        # open the output file before the command is started, so that it does not run if this fails
+        f = open(os.path.join(cwd, output_name), 'wb') if output_name is not None else None
+
+        marker = f'__DONE_{uuid.uuid4().hex}__'.encode()
+
+        try:
+            # the command is not run if cd fails
+            self.proc.stdin.write(f'( cd {shlex.quote(cwd)} && {{ {_with_prel(prel, run)}\n}} ) < /dev/null\necho "{marker.decode()} $?"\n'.encode())
+            self.proc.stdin.flush()
+
+            for line in iter(self.proc.stdout.readline, b''):
+                # the marker may follow output that does not end with a newline
+                out, found, status = line.partition(marker)
+                if f is not None:
+                    f.write(out)
+                sys.stdout.buffer.write(out)
+                sys.stdout.flush()
+                if found:
+                    return int(status)
+        finally:
+            if f is not None:
+                f.close()
+
+        raise RuntimeError('The shell session exited unexpectedly')
+
+    def close(self):
+        """
+        Method to end the session.
+
+        """
+        if self.proc.poll() is None:
+            self.proc.stdin.close()
+            self.proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _run_stage(run, config_machine, step, output_name=None, shell=None, cwd=None):
+    """
+    Function to run a computational step, either in a new shell or in a persistent shell session
+
+    Parameters
+    ----------
+    run : str
+        command to run
+    config_machine : dict
+        dictionary with computational information, which we'll use in this set of computations.
+    step : str
+        name of the computational step which is computed ('scf', 'nscf', etc.)
+    output_name : str, optional
+        name of the file to which the standard output is also written, default: None
+    shell : _ShellSession, optional
+        persistent shell session in which to run the step, default: None (run in a new shell)
+    cwd : str, optional
+        directory in which to run the step, default: current working directory
+
+    Returns
+    -------
+    None
+
+    """
+    if shell is not None:
+        shell.run(run, output_name, cwd=cwd, prel=preliminary_commands(config_machine, step, global_coms=False))
+    elif output_name is not None:
+        _run_tee(run, output_name, cwd=cwd, prel=preliminary_commands(config_machine, step))
+    else:
+        subprocess.run(preliminary_commands(config_machine, step) + run, shell=True, cwd=cwd)
+
+
+def _run_stages(config_machine, stages):
+    """
+    Function to run a chain of computational steps in one persistent shell session.
+    Used to run independent branches of the qe2pert calculation in separate processes.
+
+    Parameters
+    ----------
+    config_machine : dict
+        dictionary with computational information, which we'll use in this set of computations.
+    stages : list
+        list of (function, args) pairs; each function is called as function(*args, shell=shell)
+
+    Returns
+    -------
+    None
+
+    """
+    with _ShellSession(config_machine) as shell:
+        for func, args in stages:
+            func(*args, shell=shell)
+
+
 def run_perturbo(source_folder, perturbo_driver_dir_path, config_machine,
                  input_name='pert.in', output_name='pert.out'):
     """
@@ -41,21 +295,17 @@ def run_perturbo(source_folder, perturbo_driver_dir_path, config_machine,
 
     command = run_from_config_machine(config_machine, 'perturbo')
 
-    run = f'{command} -i {input_name} | tee {output_name}'
+    run = f'{command} -i {input_name}'
 
-    os.chdir(perturbo_driver_dir_path)
-
-    print(f'\n ====== Path ======= :\n {os.getcwd()}\n')
+    print(f'\n ====== Path ======= :\n {perturbo_driver_dir_path}\n')
 
     print(f' === Running Perturbo === :\n {run}')
     sys.stdout.flush()
 
-    subprocess.run(preliminary_commands(config_machine, 'perturbo') + run, shell=True)
-
-    os.chdir(source_folder)
+    _run_stage(run, config_machine, 'perturbo', output_name, cwd=perturbo_driver_dir_path)
     
 
-def preliminary_commands(config_machine, step):
+def preliminary_commands(config_machine, step, global_coms=True):
     """
     Function which define all comands which you want to run before the qe2pert computations and
     each separate computation
@@ -66,11 +316,13 @@ def preliminary_commands(config_machine, step):
         dictionary, which include the list of running commands
     step : str
         name of the computational step which is computed ('scf', 'nscf', etc.)
+    global_coms : bool, optional
+        include the commands common to all the steps, default: True
     """
 
     print(' == Prel commands == :')
     list_of_coms = ''
-    if 'prel_coms' in config_machine:
+    if global_coms and 'prel_coms' in config_machine:
         for com in config_machine['prel_coms']:
             print(f' ======= Run ======= :\n {com}')
             sys.stdout.flush()
@@ -83,7 +335,7 @@ def preliminary_commands(config_machine, step):
     return list_of_coms
     
 
-def run_scf(source_folder, work_path, config_machine, input_name='scf.in', output_name='scf.out'):
+def run_scf(source_folder, work_path, config_machine, input_name='scf.in', output_name='scf.out', shell=None):
     """
     Function for scf calculation
 
@@ -99,6 +351,8 @@ def run_scf(source_folder, work_path, config_machine, input_name='scf.in', outpu
         name of the input file, default: 'scf.in'
     output_name : str, optional
         name of the output file, default: 'scf.out'
+    shell : _ShellSession, optional
+        persistent shell session in which to run the step, default: None (run in a new shell)
 
     Returns
     -------
@@ -107,21 +361,19 @@ def run_scf(source_folder, work_path, config_machine, input_name='scf.in', outpu
     """
 
     command = run_from_config_machine(config_machine, 'scf')
-    run = f'{command} -i {input_name} | tee {output_name}'
+    run = f'{command} -i {input_name}'
 
-    os.chdir(f'{work_path}/pw-ph-wann/scf/')
+    run_cwd = f'{work_path}/pw-ph-wann/scf/'
 
-    print(f'\n ====== Path ======= :\n {os.getcwd()}\n')
+    print(f'\n ====== Path ======= :\n {run_cwd}\n')
 
     print(f' === Running scf === :\n {run}')
     sys.stdout.flush()
 
-    subprocess.run(preliminary_commands(config_machine, 'scf') + run, shell=True)
-
-    os.chdir(source_folder)
+    _run_stage(run, config_machine, 'scf', output_name, shell, cwd=run_cwd)
     
 
-def run_phonon(source_folder, work_path, config_machine, prefix, input_name='ph.in', output_name='ph.out'):
+def run_phonon(source_folder, work_path, config_machine, prefix, input_name='ph.in', output_name='ph.out', shell=None):
     """
     Function for nscf calculation
 
@@ -139,6 +391,8 @@ def run_phonon(source_folder, work_path, config_machine, prefix, input_name='ph.
         name of the input file, default: 'ph.in'
     output_name : str, optional
         name of the output file, default: 'ph.out'
+    shell : _ShellSession, optional
+        persistent shell session in which to run the step, default: None (run in a new shell)
 
     Returns
     -------
@@ -147,29 +401,27 @@ def run_phonon(source_folder, work_path, config_machine, prefix, input_name='ph.
     """
 
     command = run_from_config_machine(config_machine, 'phonon')
-    run = f'{command} -i {input_name} | tee {output_name}'
+    run = f'{command} -i {input_name}'
 
-    os.chdir(f'{work_path}/pw-ph-wann/phonon/')
+    run_cwd = f'{work_path}/pw-ph-wann/phonon/'
     softlink = '../scf/tmp'
-    print(f'\n ====== Path ======= :\n {os.getcwd()}\n')
+    print(f'\n ====== Path ======= :\n {run_cwd}\n')
     print(f'\n =Link tmp from scf= :\n {softlink}')
     sys.stdout.flush()
-    os.symlink(softlink, 'tmp')
+    os.symlink(softlink, os.path.join(run_cwd, 'tmp'))
 
     print(f' == Running Phonon = :\n {run}')
     sys.stdout.flush()
 
-    subprocess.run(preliminary_commands(config_machine, 'phonon') + run, shell=True)
+    _run_stage(run, config_machine, 'phonon', output_name, shell, cwd=run_cwd)
     
-    nq_num = define_nq_num(output_name)
+    nq_num = define_nq_num(os.path.join(run_cwd, output_name))
     print(f' == Collect files == :\n ph_collection({prefix},{nq_num})')
     sys.stdout.flush()
-    ph_collection(prefix, nq_num)
-    
-    os.chdir(source_folder)
+    ph_collection(prefix, nq_num, run_cwd)
 
     
-def run_nscf(source_folder, work_path, config_machine, input_name='nscf.in', output_name='nscf.out'):
+def run_nscf(source_folder, work_path, config_machine, prefix, input_name='nscf.in', output_name='nscf.out', shell=None):
     """
     Function for nscf calculation
 
@@ -181,10 +433,14 @@ def run_nscf(source_folder, work_path, config_machine, input_name='nscf.in', out
         path to dir with input file, where we'll run the calculations
     config_machine : dict
         dictionary, which include the commands for nscf calculation
+    prefix : str
+        prefix which we use for the filenames
     input_name : str, optional
         name of the input file, default: 'nscf.in'
     output_name : str, optional
         name of the output file, default: 'nscf.out'
+    shell : _ShellSession, optional
+        persistent shell session in which to run the step, default: None (run in a new shell)
 
     Returns
     -------
@@ -193,24 +449,25 @@ def run_nscf(source_folder, work_path, config_machine, input_name='nscf.in', out
     """
 
     command = run_from_config_machine(config_machine, 'nscf')
-    run = f'{command} -i {input_name} | tee {output_name}'
-
-    os.chdir(f'{work_path}/pw-ph-wann/nscf/')
-    softlink = '../scf/tmp'
-    print(f'\n ====== Path ======= :\n {os.getcwd()}\n')
-    print(f'\n =Link tmp from scf= :\n {softlink}')
+    run = f'{command} -i {input_name}'
+
+    # copy (not link) the save-file from scf calculation, so that nscf
+    # does not overwrite the scf data used by the phonon calculation
+    run_cwd = f'{work_path}/pw-ph-wann/nscf/'
+    os.mkdir(os.path.join(run_cwd, 'tmp'))
+    src = f'../scf/tmp/{prefix}.save'
+    print(f'\n ====== Path ======= :\n {run_cwd}\n')
+    print(f'\n =Copy tmp from scf= :\n {src}')
     sys.stdout.flush()
-    os.symlink(softlink, 'tmp')
+    shutil.copytree(os.path.join(run_cwd, src), os.path.join(run_cwd, f'tmp/{prefix}.save'))
 
     print(f' === Running nscf === :\n {run}')
     sys.stdout.flush()
 
-    subprocess.run(preliminary_commands(config_machine, 'nscf') + run, shell=True)
-
-    os.chdir(source_folder)
+    _run_stage(run, config_machine, 'nscf', output_name, shell, cwd=run_cwd)
     
 
-def run_wannier(source_folder, work_path, config_machine, prefix, input_name='pw2wan.in', output_name='pw2wan.out'):
+def run_wannier(source_folder, work_path, config_machine, prefix, input_name='pw2wan.in', output_name='pw2wan.out', shell=None):
     """
     Function for wannier90 calculation
 
@@ -228,6 +485,8 @@ def run_wannier(source_folder, work_path, config_machine, prefix, input_name='pw
         name of the input file, default: 'pw2wan.in'
     output_name : str, optional
         name of the output file, default: 'pw2wan.out'
+    shell : _ShellSession, optional
+        persistent shell session in which to run the step, default: None (run in a new shell)
 
     Returns
     -------
@@ -238,38 +497,36 @@ def run_wannier(source_folder, work_path, config_machine, prefix, input_name='pw
     command = run_from_config_machine(config_machine, 'wannier90')
     run = f'{command} -pp {prefix}'
     
-    # link the save-file from scf calculation
-    os.chdir(f'{work_path}/pw-ph-wann/wann/')
-    os.mkdir('tmp')
-    softlink = f'../../scf/tmp/{prefix}.save'
-    print(f'\n ====== Path ======= :\n {os.getcwd()}\n')
-    print(f'\n =Link tmp from scf= :\n {softlink}')
+    # link the save-file from nscf calculation
+    run_cwd = f'{work_path}/pw-ph-wann/wann/'
+    os.mkdir(os.path.join(run_cwd, 'tmp'))
+    softlink = f'../../nscf/tmp/{prefix}.save'
+    print(f'\n ====== Path ======= :\n {run_cwd}\n')
+    print(f'\n =Link tmp from nscf :\n {softlink}')
     sys.stdout.flush()
-    os.symlink(softlink, f'tmp/{prefix}.save')
+    os.symlink(softlink, os.path.join(run_cwd, f'tmp/{prefix}.save'))
 
     # first run of wannier90
     print(f' === Running pp === :\n {run}')
     sys.stdout.flush()
-    subprocess.run(preliminary_commands(config_machine, 'wannier90') + run, shell=True)
+    _run_stage(run, config_machine, 'wannier90', shell=shell, cwd=run_cwd)
     
     # run of pw2wan
     command = run_from_config_machine(config_machine, 'pw2wannier90')
-    run = f'{command} -i {input_name} | tee {output_name}'
+    run = f'{command} -i {input_name}'
     print(f' = Running pw2wan = :\n {run}')
     sys.stdout.flush()
-    subprocess.run(preliminary_commands(config_machine, 'pw2wannier90') + run, shell=True)
+    _run_stage(run, config_machine, 'pw2wannier90', output_name, shell, cwd=run_cwd)
     
     # second run of wannier90
     command = run_from_config_machine(config_machine, 'wannier90')
     run = f'{command} {prefix}'
     print(f' = Running Wannier= :\n {run}')
     sys.stdout.flush()
-    subprocess.run(preliminary_commands(config_machine, 'wannier90') + run, shell=True)
-    
-    os.chdir(source_folder)
+    _run_stage(run, config_machine, 'wannier90', shell=shell, cwd=run_cwd)
     
 
-def run_qe2pert(source_folder, work_path, config_machine, prefix, input_name='qe2pert.in', output_name='qe2pert.out'):
+def run_qe2pert(source_folder, work_path, config_machine, prefix, input_name='qe2pert.in', output_name='qe2pert.out', shell=None):
     """
     Function for qe2pert calculation
 
@@ -287,6 +544,8 @@ def run_qe2pert(source_folder, work_path, config_machine, prefix, input_name='qe
        name of the input file, default: 'qe2pert.in'
     output_name : str, optional
        name of the output file, default: 'qe2pert.out'
+    shell : _ShellSession, optional
+        persistent shell session in which to run the step, default: None (run in a new shell)
 
     Returns
     -------
@@ -295,38 +554,36 @@ def run_qe2pert(source_folder, work_path, config_machine, prefix, input_name='qe
     """
 
     command = run_from_config_machine(config_machine, 'qe2pert')
-    run = f'{command} -i {input_name} | tee {output_name}'
+    run = f'{command} -i {input_name}'
 
     # link the save-file from scf calculation
-    os.chdir(f'{work_path}/qe2pert/')
-    os.mkdir('tmp')
+    run_cwd = f'{work_path}/qe2pert/'
+    os.mkdir(os.path.join(run_cwd, 'tmp'))
     softlink = f'../../pw-ph-wann/nscf/tmp/{prefix}.save'
-    print(f'\n ====== Path ======= :\n {os.getcwd()}\n')
+    print(f'\n ====== Path ======= :\n {run_cwd}\n')
     print(f'\n =Link tmp from nscf :\n {softlink}')
     sys.stdout.flush()
-    os.symlink(softlink, f'tmp/{prefix}.save')
+    os.symlink(softlink, os.path.join(run_cwd, f'tmp/{prefix}.save'))
     
     # link rest files
     softlink = f'../pw-ph-wann/wann/{prefix}_u.mat'
     print(f'\n = Link rest files = :\n {softlink};')
     sys.stdout.flush()
-    os.symlink(softlink, f'{prefix}_u.mat')
+    os.symlink(softlink, os.path.join(run_cwd, f'{prefix}_u.mat'))
     softlink = f'../pw-ph-wann/wann/{prefix}_u_dis.mat'
     print(f'\n {softlink};')
     sys.stdout.flush()
-    os.symlink(softlink, f'{prefix}_u_dis.mat')
+    os.symlink(softlink, os.path.join(run_cwd, f'{prefix}_u_dis.mat'))
     softlink = f'../pw-ph-wann/wann/{prefix}_centres.xyz'
     print(f'\n {softlink};')
     sys.stdout.flush()
-    os.symlink(softlink, f'{prefix}_centres.xyz')
+    os.symlink(softlink, os.path.join(run_cwd, f'{prefix}_centres.xyz'))
 
     # run qe2pert
     print(f' = Running qe2pert = :\n {run}')
     sys.stdout.flush()
     
-    subprocess.run(preliminary_commands(config_machine, 'qe2pert') + run, shell=True)
-
-    os.chdir(source_folder)
+    _run_stage(run, config_machine, 'qe2pert', output_name, shell, cwd=run_cwd)
 
 
 def get_test_materials(test_name, test_case, config_machine, source_folder):
@@ -366,9 +623,9 @@ def get_test_materials(test_name, test_case, config_machine, source_folder):
     config_machine = open_yaml(os.path.join(source_folder, f'config_machine/{config_machine}'))
 
     # determine needed paths
-    perturbo_inputs_dir_path = [x[0] for x in os.walk(source_folder) if x[0].endswith(inputs_path_suffix)][0]
+    perturbo_inputs_dir_path = _find_suffix(source_folder, inputs_path_suffix)
     work_path                = perturbo_scratch_dir_config(source_folder, perturbo_inputs_dir_path, test_name, config_machine, test_case)
-    ref_path                 = [x[0] for x in os.walk(source_folder) if x[0].endswith(ref_data_path_suffix)][0]
+    ref_path                 = _find_suffix(source_folder, ref_data_path_suffix)
 
     # input yaml for perturbo job
     pert_input = open_yaml(f'{work_path}/pert_input.yml')
@@ -407,6 +664,10 @@ def run_epr_calculation(epr_name, config_machine, source_folder):
         #. Run wannier90 calculation
         #. Run qe2pert calculation
 
+    If ``parallel_stages: true`` is set in config_machine, the phonon calculation runs
+    concurrently with the nscf and wannier90 calculations, each with its own launcher from comp_info,
+    so the allocation must be sized for both of them. By default, all the stages run serially.
+
     Parameters
     ----------
     epr_name : str
@@ -439,20 +700,40 @@ def run_epr_calculation(epr_name, config_machine, source_folder):
     # define the prefix - we'll need to have it in the later computations
     prefix = input_yaml[epr_name]['prefix']
 
-    # run scf
-    run_scf(source_folder, work_path, config_machine)
-    
-    # run phonon
-    run_phonon(source_folder, work_path, config_machine, prefix)
+    # the stages share one persistent shell session, except for the two concurrent
+    # branches below, each of which opens its own session in its worker process
+    with _ShellSession(config_machine) as shell:
 
-    # run nscf
-    run_nscf(source_folder, work_path, config_machine)
-    
-    # run wannier90
-    run_wannier(source_folder, work_path, config_machine, prefix)
-    
-    # run qe2pert
-    run_qe2pert(source_folder, work_path, config_machine, prefix)
+        # run scf
+        run_scf(source_folder, work_path, config_machine, shell=shell)
+
+        if config_machine.get('parallel_stages', False):
+            # phonon and nscf only depend on scf, and wannier90 only on nscf,
+            # so run phonon in one process and nscf -> wannier90 in another
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                # run phonon
+                phonon = executor.submit(_run_stages, config_machine,
+                                         [(run_phonon, (source_folder, work_path, config_machine, prefix))])
+
+                # run nscf and wannier90
+                nscf_wannier = executor.submit(_run_stages, config_machine,
+                                               [(run_nscf, (source_folder, work_path, config_machine, prefix)),
+                                                (run_wannier, (source_folder, work_path, config_machine, prefix))])
+
+                phonon.result()
+                nscf_wannier.result()
+        else:
+            # run phonon
+            run_phonon(source_folder, work_path, config_machine, prefix, shell=shell)
+
+            # run nscf
+            run_nscf(source_folder, work_path, config_machine, prefix, shell=shell)
+
+            # run wannier90
+            run_wannier(source_folder, work_path, config_machine, prefix, shell=shell)
+
+        # run qe2pert
+        run_qe2pert(source_folder, work_path, config_machine, prefix, shell=shell)
 
     return
 
@@ -484,7 +765,7 @@ def clean_test_materials(test_name, new_outs, config_machine, source_folder):
     config_machine = open_yaml(os.path.join(source_folder, f'config_machine/{config_machine}'))
 
     # determine paths
-    perturbo_inputs_dir_path = [x[0] for x in os.walk(source_folder) if x[0].endswith(inputs_path_suffix)][0]
+    perturbo_inputs_dir_path = _find_suffix(source_folder, inputs_path_suffix)
     work_path                = perturbo_scratch_dir_config(source_folder, perturbo_inputs_dir_path, test_name, config_machine, rm_preexist_dir=False)
 
     if os.path.isdir(work_path):
@@ -94,3 +94,35 @@ def test_effective_mass(gaas_bands, n, kpoint, max_distance, direction, expected
     print(gaas_bands.bands)
     m = gaas_bands.effective_mass(n, kpoint, max_distance, direction)
     assert(np.isclose(expected_m, m))
+
+
+@pytest.mark.parametrize("n, kpoints, max_distance, direction", [
+                         [9, [[0, 0, 0], [0, 0, 0]], 0.1, [0.5, 0.5, 0.5]],
+                         [5, [[0.5, 0, 0.5], [0, 0, 0]], 0.2, [0.5, 0, 0.5]]
+])
+def test_effective_mass_kpoints(gaas_bands, n, kpoints, max_distance, direction):
+    """
+    Method to test effective_mass with several k-points at once
+
+    Parameters
+    ----------
+    n : int
+       Index of the band for which to calculate the effective mass.
+
+    kpoints : list
+       The k-points on which to center the calculations.
+
+    max_distance : float
+       Maximum distance between the center k-point and k-points to include in the parabolic approximation.
+
+    direction : array_like
+       The k-point specifying the direction of the effective mass.
+
+    """
+    kpoints = np.transpose(kpoints)
+    m = gaas_bands.effective_mass(n, kpoints, max_distance, direction)
+
+    assert(m.shape == (kpoints.shape[1],))
+
+    for i in range(kpoints.shape[1]):
+        assert(np.isclose(m[i], gaas_bands.effective_mass(n, kpoints[:, i], max_distance, direction)))
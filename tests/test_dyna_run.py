@@ -0,0 +1,154 @@
+import numpy as np
+import pytest
+import os
+import h5py
+import yaml
+
+import perturbopy.postproc as ppy
+from perturbopy.io_utils.io import open_yaml
+
+numk, numb = 7, 3
+num_steps = {1: 4, 2: 5}
+
+
+def write_cdyna(path, snaps, combined=False):
+    """
+    Method to write a synthetic cdyna HDF5 file.
+
+    Parameters
+    ----------
+    path : str
+       Path of the HDF5 file to write.
+
+    snaps : dict
+       Distribution functions of each run, with shape (num_steps, numk, numb).
+
+    combined : bool, optional
+       If true, the snaps of each run are stored in a single snap_t_all dataset.
+
+    """
+    with h5py.File(path, 'w') as f:
+        f['band_structure_ryd'] = np.linspace(0.0, 1.0, numk * numb).reshape(numk, numb)
+        f['num_runs'] = len(snaps)
+
+        for irun, snap in snaps.items():
+            grp = f.create_group(f'dynamics_run_{irun}')
+            grp['num_steps'] = snap.shape[0]
+            grp['time_step_fs'] = 1.0
+
+            if combined:
+                grp['snap_t_all'] = snap
+            else:
+                for itime in range(snap.shape[0]):
+                    grp[f'snap_t_{itime+1}'] = snap[itime]
+
+
+@pytest.fixture()
+def dyna_files(tmp_path):
+    """
+    Method to generate synthetic cdyna, tet and YAML files for a dynamics-run calculation.
+
+    Returns
+    -------
+    paths : dict
+       Paths of the per-snap cdyna file, the snap_t_all cdyna file, the tet file and the YAML file.
+
+    snaps : dict
+       Distribution functions of each run, with shape (num_steps, numk, numb).
+
+    """
+    rng = np.random.default_rng(0)
+    snaps = {irun: rng.random((steps, numk, numb)) for irun, steps in num_steps.items()}
+
+    paths = {'cdyna': str(tmp_path / 'cdyna.h5'),
+             'cdyna_all': str(tmp_path / 'cdyna_all.h5'),
+             'tet': str(tmp_path / 'tet.h5'),
+             'yaml': str(tmp_path / 'pert_output.yml')}
+
+    write_cdyna(paths['cdyna'], snaps)
+    write_cdyna(paths['cdyna_all'], snaps, combined=True)
+
+    with h5py.File(paths['tet'], 'w') as f:
+        f['kpts_all_crys_coord'] = rng.random((numk, 3))
+
+    # reuse the basic data of the GaAs bands calculation
+    pert_dict = open_yaml(os.path.join("refs", "gaas_bands.yml"))
+    pert_dict.pop('bands')
+    pert_dict['input parameters']['after conversion']['calc_mode'] = 'dynamics-run'
+
+    with open(paths['yaml'], 'w') as f:
+        yaml.safe_dump(pert_dict, f)
+
+    return paths, snaps
+
+
+def test_snap_t(dyna_files):
+    """
+    Method to test that the per-snap and snap_t_all layouts give the same distribution functions
+
+    """
+    paths, snaps = dyna_files
+
+    dyna_run = ppy.DynaRun.from_hdf5_yaml(paths['cdyna'], paths['tet'], paths['yaml'])
+    dyna_run_all = ppy.DynaRun.from_hdf5_yaml(paths['cdyna_all'], paths['tet'], paths['yaml'])
+
+    for irun, snap in snaps.items():
+        expected = np.transpose(snap, (2, 1, 0))
+
+        assert(dyna_run[irun].snap_t.shape == (numb, numk, num_steps[irun]))
+        assert(np.array_equal(dyna_run[irun].snap_t, expected))
+        assert(np.array_equal(dyna_run_all[irun].snap_t, expected))
+
+
+def test_reload_rewritten(dyna_files):
+    """
+    Method to test that a cdyna file can be rewritten and reloaded after a DynaRun object was created from it
+
+    """
+    paths, snaps = dyna_files
+
+    ppy.DynaRun.from_hdf5_yaml(paths['cdyna'], paths['tet'], paths['yaml'])
+
+    new_snaps = {irun: snap * 2.0 for irun, snap in snaps.items()}
+    write_cdyna(paths['cdyna'], new_snaps)
+
+    dyna_run = ppy.DynaRun.from_hdf5_yaml(paths['cdyna'], paths['tet'], paths['yaml'])
+
+    for irun, snap in new_snaps.items():
+        assert(np.array_equal(dyna_run[irun].snap_t, np.transpose(snap, (2, 1, 0))))
+
+
+@pytest.mark.parametrize("cdyna", ['cdyna', 'cdyna_all'])
+def test_snap_t_dtype(dyna_files, cdyna):
+    """
+    Method to test that the distribution functions are stored in the requested floating point type
+
+    Parameters
+    ----------
+    cdyna : str
+       Key of the cdyna file to read, with per-snap or snap_t_all layout.
+
+    """
+    paths, snaps = dyna_files
+
+    dyna_run_64 = ppy.DynaRun.from_hdf5_yaml(paths[cdyna], paths['tet'], paths['yaml'])
+    dyna_run_32 = ppy.DynaRun.from_hdf5_yaml(paths[cdyna], paths['tet'], paths['yaml'], dtype=np.float32)
+
+    for irun in snaps:
+        assert(dyna_run_64[irun].snap_t.dtype == np.float64)
+        assert(dyna_run_32[irun].snap_t.dtype == np.float32)
+        assert(np.allclose(dyna_run_32[irun].snap_t, dyna_run_64[irun].snap_t, rtol=1e-6, atol=0.0))
+
+
+def test_snap_t_all_num_steps(dyna_files):
+    """
+    Method to test that a snap_t_all dataset inconsistent with num_steps is rejected
+
+    """
+    paths, snaps = dyna_files
+
+    with h5py.File(paths['cdyna_all'], 'a') as f:
+        f['dynamics_run_1/num_steps'][()] = num_steps[1] + 1
+
+    with pytest.raises(ValueError, match='num_steps'):
+        ppy.DynaRun.from_hdf5_yaml(paths['cdyna_all'], paths['tet'], paths['yaml'])